@@ -172,6 +172,7 @@ class basic_ipcore_codegen(noc_codegen_ext):
     """
     Code generation extension for Ipcore objects.
     """
+    __slots__ = ("ipcore_ref",)
     
     def __init__(self, codegen_ref):
         noc_codegen_ext.__init__(self, codegen_ref)
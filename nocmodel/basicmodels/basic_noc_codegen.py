@@ -50,6 +50,8 @@ class basic_noc_arch_vhdl(noc_codegen_ext):
     This extension object generates the architecture needed to connect all 
     objects into a top VHDL file.
     """
+    __slots__ = ("noc_ref",)
+    
     def __init__(self, codegen_ref):
         noc_codegen_ext.__init__(self, codegen_ref)
         self.noc_ref = codegen_ref.nocobject_ref
@@ -78,7 +80,7 @@ class basic_noc_arch_vhdl(noc_codegen_ext):
                 # nocobject which belongs
                 csig = sig.copy()
                 csig["back_ref"] = obj
-                codegen_ref.external_signals.append(csig)
+                codegen_ref.append_external_signal(csig)
             
         # 3. Build implementation string
         codegen_ref.implementation += "-- Implementation for '%s' name '%s' generated by '%s'\n" % (repr(self.noc_ref), self.noc_ref.name, repr(self))
@@ -87,9 +89,8 @@ class basic_noc_arch_vhdl(noc_codegen_ext):
         for obj in self.noc_ref.all_list():
             # add only for routers and ipcores (WARNING)
             if isinstance(obj, (router, ipcore)):
-                if obj.codegen.interface_hash == "":
-                    # update hash
-                    obj.codegen.model_hash()
+                # update hash (only recalculated if the model changed)
+                obj.codegen.get_model_hash()
                 # check if the component is already declared
                 if hash(obj.codegen.interface_hash) in hash_list:
                     # already declared component
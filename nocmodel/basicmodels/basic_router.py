@@ -296,6 +296,7 @@ class basic_router_codegen(noc_codegen_ext):
     """
     Code generation extension for Router objects.
     """
+    __slots__ = ("router_ref",)
     
     def __init__(self, codegen_ref):
         noc_codegen_ext.__init__(self, codegen_ref)
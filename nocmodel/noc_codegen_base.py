@@ -38,18 +38,44 @@ Base for code generation support
 This module defines:
 * Class 'noc_codegen_base'
 * Class 'noc_codegen_ext'
+* Classes 'codegen_generic', 'codegen_port' and 'codegen_signal'
+* Functions 'get_new_generic', 'get_new_port' and 'get_new_signal'
 """
 
 from myhdl import intbv, SignalType
-from nocmodel import *
+from noc_base import nocobject, noc
 
-#import scipy
-#import networkx as nx
-from copy import deepcopy
-from sys import exc_info
+from operator import itemgetter
+import hashlib
 import warnings
 
-class noc_codegen_base():
+# public names for "from noc_codegen_base import *"
+__all__ = ["noc_codegen_base", "noc_codegen_ext", "codegen_generic", 
+    "codegen_port", "codegen_signal", "get_new_generic", "get_new_port", 
+    "get_new_signal"]
+
+class _slotted(object):
+    """
+    Base for classes that declare __slots__: gives them a pickle state 
+    with the slots set on the instance (and its __dict__, if any), so they 
+    can be pickled with any protocol.
+    """
+    __slots__ = ()
+    
+    def __getstate__(self):
+        state = {}
+        for cls in self.__class__.__mro__:
+            for key in cls.__dict__.get("__slots__", ()):
+                if hasattr(self, key):
+                    state[key] = getattr(self, key)
+        state.update(getattr(self, "__dict__", {}))
+        return state
+        
+    def __setstate__(self, state):
+        for key, value in state.iteritems():
+            setattr(self, key, value)
+
+class noc_codegen_base(_slotted):
     """
     Base class for code generator
     
@@ -73,8 +99,7 @@ class noc_codegen_base():
     
     Objects type:
     * docheader, libraries, modulename and implementation are simple strings.
-    * generics are list of dictionaries with this required keys:
-        * "class" : always "generic"
+    * generics are list of 'codegen_generic' objects with this keys:
         * "name"
         * "type" : string formatted data type 
         * "type_array" : 2-element list of strings that declares array boundaries 
@@ -82,8 +107,7 @@ class noc_codegen_base():
         * "default_value"
         * "current_value" 
         * "description"
-    * ports are list of dictionaries with this required keys:
-        * "class" : always "port"
+    * ports are list of 'codegen_port' objects with this keys:
         * "name"
         * "type" : port type, if applicable
         * "nocport" : index to related port in the nocobject' ports dictionary or
@@ -91,8 +115,7 @@ class noc_codegen_base():
         * "signal_list" : list of signals that compose the port
         * "description"
     * external_signals are list of signals that aren't related to any port.
-    * signals are dictionaries with this required keys:
-        * "class" : always "signal"
+    * signals are 'codegen_signal' objects with this keys:
         * "name"
         * "type" : string formatted data type 
         * "type_array" : 2-element list of strings that declares array boundaries 
@@ -102,12 +125,18 @@ class noc_codegen_base():
         * "related_generics" : when the data type is an array, this list has 
             references to generics to be used to build array declaration.
         * "description"
+        * "back_ref" : optional reference to the object that owns the signal
+    * generics, ports and signals objects support dictionary-like access to 
+      its keys (obj["name"], obj.update(...)) and attribute access (obj.name). 
+      They compare equal when they have the same class and the same keys 
+      and values.
         
     Attributes:
     * modulename
     * nocobject_ref
-    * docheader
-    * libraries
+    * docheader (optional)
+    * libraries (optional)
+    * external_conversion (optional)
     * generics
     * ports
     * external_signals
@@ -117,6 +146,9 @@ class noc_codegen_base():
     Notes:
     * Code generation methods are meant to return strings. The user is 
       responsible to write it in files.
+    * Code generation methods should collect their output pieces in a list 
+      and build the final string with _emit() or _emit_lines(), instead of 
+      repeated string concatenation.
     * This object maintains the code model and use it to generate code. Any
       particular changes or adjustments to the model should be done by a 
       'noc_codegen_ext' object. 
@@ -125,20 +157,36 @@ class noc_codegen_base():
       could change if the noc objects needs to keep hierarchy in its 
       internal implementation). 
       This converter keeps routers and ipcores hierarchy.
+    * Generics, ports and external signals are indexed by name. Use the 
+      add_* methods (or append_external_signal() for an existing signal 
+      object) to modify them; code that appends entries directly must also 
+      update the related index (_generics_by_name, _ports_by_name or 
+      _external_by_name) and call invalidate_hash(). Indexed entries 
+      cannot be renamed.
+    * model_hash() always recalculates the hash. get_model_hash() returns 
+      the cached hash until the model changes through the add_* methods; 
+      call invalidate_hash() after changing entries directly.
+    * Base attributes are declared in __slots__, and extended classes 
+      should declare their own attributes the same way. Optional arguments 
+      must be one of the declared attributes (extended classes without 
+      __slots__ accept any name).
+    * Optional attributes are not assigned until they are set. Read them 
+      with _s() (docheader, libraries) or getattr() with a default 
+      (external_conversion: False).
     """
+    __slots__ = ("nocobject_ref", "external_conversion", "docheader", 
+        "libraries", "modulename", "generics", "ports", "external_signals", 
+        "implementation", "interface_hash", "_generics_by_name", 
+        "_ports_by_name", "_external_by_name", "_hash_dirty")
     
     def __init__(self, nocobject_ref, **kwargs):
         # nocobject reference
-        if not isinstance(nocobject_ref, (nocobject, noc)):
+        if not isinstance(nocobject_ref, _VALID_REFS):
             raise TypeError("Argument must be an instance of nocobject or noc class")
         self.nocobject_ref = nocobject_ref
         
-        # External conversion flag
-        self.external_conversion = False
-
-        # string type objects
-        self.docheader = ""
-        self.libraries = ""
+        # string type objects. Optional attributes (docheader, libraries 
+        # and external_conversion flag) are only set when used.
         self.modulename = ""
         
         # list of dictionaries (generic and port)
@@ -146,15 +194,24 @@ class noc_codegen_base():
         self.ports = []
         self.external_signals = []
         
+        # name indexes for generics, ports and external signals
+        self._generics_by_name = {}
+        self._ports_by_name = {}
+        self._external_by_name = {}
+        
         # implementation 
         self.implementation = ""
         
         # module hash
         self.interface_hash = ""
+        self._hash_dirty = True
         
         # optional arguments
         for key in kwargs.keys():
-            setattr(self, key, kwargs[key])
+            try:
+                setattr(self, key, kwargs[key])
+            except AttributeError:
+                raise TypeError("Unexpected optional argument '%s'." % key)
        
     # main methods
     def generate_file(self):
@@ -248,6 +305,77 @@ class noc_codegen_base():
         """
         raise NotImplementedError("What language for code generation?")
 
+    # output helpers
+    def _s(self, name):
+        """
+        Read an optional string attribute.
+        
+        Argument:
+        * name: attribute name
+        
+        Returns: the attribute value, or "" if it was never set.
+        """
+        return getattr(self, name, "")
+        
+    def _get_indent(self, level=1, tab=None):
+        """
+        Indentation string for add_tab implementations.
+        
+        Arguments:
+        * level: how many indentation levels. Default 1
+        * tab: string for one indentation level. None means 4-space tabs
+        
+        Returns: the indentation string. Common cases are precomputed.
+        """
+        if tab is None or tab == _TAB:
+            if 0 <= level < len(_INDENTS):
+                return _INDENTS[level]
+            tab = _TAB
+        return tab * level
+        
+    def _emit(self, parts):
+        """
+        Join a sequence of output strings.
+        
+        Argument:
+        * parts: list or iterable of strings
+        
+        Returns: the concatenated string.
+        """
+        return "".join(parts)
+        
+    def _emit_lines(self, parts):
+        """
+        Join a sequence of output strings, one per line.
+        
+        Argument:
+        * parts: list or iterable of strings
+        
+        Returns: the strings joined with newlines.
+        """
+        return "\n".join(parts)
+
+    def _resolve_entry(self, container, by_name, key):
+        """
+        Locate a generic, port or signal for the generate_*_declaration 
+        methods.
+        
+        Arguments:
+        * container : list of entries (generics, ports, external_signals or 
+          a port's signal_list)
+        * by_name : name index of container
+        * key : either a name or a list index. None returns None.
+        
+        Returns: the entry object. Raises IndexError or KeyError if not found.
+        """
+        if key is None:
+            return None
+        if isinstance(key, (int, long)):
+            return container[key]
+        if isinstance(key, basestring):
+            return by_name[key]
+        raise TypeError("Don't know how to search with '%s'." % repr(key))
+
     # codegen model management
     def add_generic(self, name, value, description="", **kwargs):
         """
@@ -260,7 +388,7 @@ class noc_codegen_base():
         * Optional arguments (just for method call format)
         
         Returns:
-        * Reference to added generic dictionary.
+        * Reference to added generic object.
         
         Note:
         * This method can override an existing generic entry.
@@ -271,20 +399,26 @@ class noc_codegen_base():
             raise TypeError("Name must be string, not '%s'." % repr(name))
 
         # supported types:
-        if not isinstance(value, (bool, int, intbv, str)):
+        if not isinstance(value, _GEN_TYPES):
             raise TypeError("Unsupported type '%s'." % repr(type(value)))
 
+        # check optional kwargs before changing the model
+        codegen_generic._check_fields(kwargs)
+
         # check if new entry
-        g = filter(lambda x: x["name"] == name, self.generics)
-        if len(g) == 0:
+        g = self._generics_by_name.get(name)
+        if g is None:
             g = get_new_generic(name = name)
+            g._indexed = True
             self.generics.append(g)
-        else:
-            g = g[0]
-        g.update(default_value = value, description = description)
+            self._generics_by_name[name] = g
+        g.default_value = value
+        g.description = description
         # optional kwargs
-        g.update(kwargs)
-        # return reference to added generic dict
+        if kwargs:
+            g.update(kwargs)
+        self._hash_dirty = True
+        # return reference to added generic object
         return g
         
     def add_port(self, name, signal_desc=None, description="", **kwargs):
@@ -293,13 +427,13 @@ class noc_codegen_base():
 
         Arguments:
         * name : must be a string
-        * signal_desc : optional dictionary with signal information included. 
+        * signal_desc : optional 'codegen_signal' object with signal information. 
           None to just add/update port without changing its signals.
         * description : 
         * Optional arguments (just for method call format)
         
         Returns:
-        * Reference to added port dictionary.
+        * Reference to added port object.
         
         Note:
         * This method can add a new port or update an existing port with new 
@@ -313,34 +447,39 @@ class noc_codegen_base():
 
         # check signal dict keys: must have at least class and name
         if signal_desc is not None:
-            if not all([x in signal_desc for x in ("class", "name")]):
-                raise TypeError("Argument signal_desc must be a signal dict ('%s')." % repr(signal_desc))
-            if signal_desc["class"] != "signal":
-                raise TypeError("Argument signal_desc must be a signal dict ('%s')." % repr(signal_desc))
+            if not isinstance(signal_desc, codegen_signal):
+                raise TypeError("Argument signal_desc must be a signal object ('%s')." % repr(signal_desc))
+
+        # check optional kwargs before changing the model
+        codegen_port._check_fields(kwargs)
 
         # check if new entry
-        p = filter(lambda x: x["name"] == name, self.ports)
-        if len(p) == 0:
+        p = self._ports_by_name.get(name)
+        if p is None:
             p = get_new_port(name = name)
+            p._indexed = True
             self.ports.append(p)
-        else:
-            p = p[0]
+            self._ports_by_name[name] = p
 
         # only update description when string is non-empty
         if description != "":
-            p.update(description = description)
+            p.description = description
 
         # check existing signal
         if signal_desc is not None:
-            sig = filter(lambda x: x["name"] == signal_desc["name"], p["signal_list"])
-            if len(sig) == 0:
-                p["signal_list"].append(signal_desc)
+            sig = p._signals_by_name.get(signal_desc.name)
+            if sig is None:
+                signal_desc._indexed = True
+                p.signal_list.append(signal_desc)
+                p._signals_by_name[signal_desc.name] = signal_desc
             else:
-                sig[0].update(signal_desc)
+                sig.update(signal_desc)
                 
         # optional kwargs
-        p.update(kwargs)
-        # return reference to added/updated port dict
+        if kwargs:
+            p.update(kwargs)
+        self._hash_dirty = True
+        # return reference to added/updated port object
         return p
         
     def add_external_signal(self, name, direction, value, description="", **kwargs):
@@ -355,7 +494,7 @@ class noc_codegen_base():
         * Optional arguments (just for method call format)
         
         Returns:
-        * Reference to added external_signals dictionary.
+        * Reference to added external signal object.
         
         Note:
         * This method can override an existing signal entry.
@@ -368,45 +507,81 @@ class noc_codegen_base():
         # supported types:
         if isinstance(value, SignalType):
             value = value._init
-        if not isinstance(value, (bool, int, intbv)):
+        if not isinstance(value, _SCALAR_TYPES):
             raise TypeError("Unsupported type '%s'." % repr(type(value)))
-        if direction not in ["in", "out"]:
+        if not isinstance(direction, basestring) or direction not in _VALID_DIRS:
             raise ValueError("Direction must be 'in' or 'out', not '%s'." % repr(direction))
+        # store the shared direction string
+        if direction == _DIR_IN:
+            direction = _DIR_IN
+        else:
+            direction = _DIR_OUT
+        # check optional kwargs before changing the model
+        codegen_signal._check_fields(kwargs)
         # check if new entry
-        sig = filter(lambda x: x["name"] == name, self.external_signals)
-        if len(sig) == 0:
+        sig = self._external_by_name.get(name)
+        if sig is None:
             sig = get_new_signal(name = name)
+            sig._indexed = True
             self.external_signals.append(sig)
-        else:
-            sig = sig[0]
-        sig.update(direction = direction, default_value = value, description = description)
+            self._external_by_name[name] = sig
+        sig.direction = direction
+        sig.default_value = value
+        sig.description = description
         # optional kwargs
-        sig.update(kwargs)
-        # return reference to added generic dict
+        if kwargs:
+            sig.update(kwargs)
+        self._hash_dirty = True
+        # return reference to added signal object
         return sig
         
+    def append_external_signal(self, signal_obj):
+        """
+        Append an existing signal object to the external signals. 
+        
+        Arguments:
+        * signal_obj : 'codegen_signal' object. It is stored as is (no copy 
+          and no value checks).
+        
+        Returns:
+        * Reference to the appended signal object.
+        
+        Note:
+        * Unlike add_external_signal(), this method does not override an 
+          existing signal with the same name: both are kept, and the name 
+          index keeps the first one.
+        """
+        if not isinstance(signal_obj, codegen_signal):
+            raise TypeError("Argument signal_obj must be a signal object ('%s')." % repr(signal_obj))
+        signal_obj._indexed = True
+        self.external_signals.append(signal_obj)
+        self._external_by_name.setdefault(signal_obj.name, signal_obj)
+        self._hash_dirty = True
+        return signal_obj
+        
     def build_implementation(self):
         """
         Try to generate the implementation section. Check if a "codemodel" 
         object exists and try to call "generate_implementation" method.
         
         If the call is successful, self.implementation will store its return
-        string. Do nothing on failure (report a warning).
-        """
-        if hasattr(self.nocobject_ref, "codemodel"):
-            implementation = ""
-            if not hasattr(self.nocobject_ref.codemodel, "generate_implementation"):
-                warnings.warn("Method 'generate_implementation()' not found.")
-            elif not callable(self.nocobject_ref.codemodel.generate_implementation):
-                warnings.warn("Attribute 'generate_implementation()' not callable")
-            else:
-                implementation = self.nocobject_ref.codemodel.generate_implementation()
-            ##except:
-                ### Report a warning instead of the exception
-                ##exctype, value = exc_info()[:2]
-                ##warnings.warn("%s: %s" % (exctype, value))
-            if isinstance(implementation, str):
-                self.implementation = implementation
+        string. Do nothing on failure (report a warning): when no 
+        "codemodel" or no callable "generate_implementation" is found, 
+        self.implementation keeps its current contents.
+        """
+        codemodel = getattr(self.nocobject_ref, "codemodel", None)
+        if codemodel is None:
+            return
+        gen = getattr(codemodel, "generate_implementation", None)
+        if gen is None:
+            warnings.warn("Method 'generate_implementation()' not found.")
+            return
+        if not callable(gen):
+            warnings.warn("Attribute 'generate_implementation()' not callable")
+            return
+        implementation = gen()
+        if isinstance(implementation, str):
+            self.implementation = implementation
 
     def model_hash(self):
         """
@@ -416,44 +591,70 @@ class noc_codegen_base():
         Two nocobject with the same model hash can be instantiated by the same
         module code (with different generics' values).
         
-        Returns: a string with a predefined format.
+        Returns: a string with the hexadecimal SHA-1 digest of the interface 
+        description.
+        
+        Note: this method always recalculates the hash and updates 
+        interface_hash. See get_model_hash() for a cached version.
         """
-        hash_str = ""
+        hash_parts = []
         
         # 1. Generics information
-        hash_gen = []
-        for g in self.generics:
-            hash_gen.append([g["name"], g["type"]])
         # sort generics by name
-        hash_gen.sort(key = lambda x: x[0])
+        hash_gen = sorted([(g.name, g.type) for g in self.generics], 
+            key = itemgetter(0))
         # add a stream of "<name><type>"
         for g in hash_gen:
-            hash_str += "%s%s" % (g[0], g[1])
+            hash_parts.append("%s%s" % g[:2])
             
         # 2. Ports information
-        hash_port = []
-        for g in self.ports:
-            hash_port.append([g["name"], g["type"], len(g["signal_list"])])
         # sort ports by name
-        hash_port.sort(key = lambda x: x[0])
+        hash_port = sorted([(g.name, g.type, len(g.signal_list)) for g in self.ports], 
+            key = itemgetter(0))
         # add a stream of "<name><type><num-of-signals>"
         for g in hash_port:
-            hash_str += "%s%s" % (g[0], g[1])
+            hash_parts.append("%s%s" % g[:2])
             
         # 3. External ports information
-        hash_ext = []
-        for g in self.external_signals:
-            hash_ext.append([g["name"], g["type"], g["direction"]])
         # sort external_signals by name
-        hash_ext.sort(key = lambda x: x[0])
+        hash_ext = sorted([(g.name, g.type, g.direction) for g in self.external_signals], 
+            key = itemgetter(0))
         # add a stream of "<name><type><direction>"
         for g in hash_ext:
-            hash_str += "%s%s" % (g[0], g[1])
+            hash_parts.append("%s%s" % g[:2])
             
+        hash_src = "".join(hash_parts)
+        # names may be unicode: hash its UTF-8 encoding
+        if isinstance(hash_src, unicode):
+            hash_src = hash_src.encode("utf-8")
+        hash_str = hashlib.sha1(hash_src).hexdigest()
         self.interface_hash = hash_str
+        self._hash_dirty = False
         return hash_str
+        
+    def get_model_hash(self):
+        """
+        Cached version of model_hash(): only recalculate the hash when the 
+        model changed through the add_* methods (or after invalidate_hash()) 
+        since the last calculation.
+        
+        Returns: the model hash string.
+        """
+        if self._hash_dirty:
+            return self.model_hash()
+        return self.interface_hash
+        
+    def invalidate_hash(self):
+        """
+        Force recalculation of the model hash on the next get_model_hash() 
+        call.
+        
+        Use it after modifying generics, ports or external signals without 
+        the add_* methods.
+        """
+        self._hash_dirty = True
     
-class noc_codegen_ext():
+class noc_codegen_ext(_slotted):
     """
     Extension class for code generator
     
@@ -469,6 +670,7 @@ class noc_codegen_ext():
       'noc_codegen_ext' object. Usually this object is related to a particular 
       nocobject (router, ipcore or channel).
     """
+    __slots__ = ("codegen_ref", "nocobject_ref")
     
     def __init__(self, codegen_ref):
         # must be related to a noc_codegen_base object
@@ -478,43 +680,227 @@ class noc_codegen_ext():
         self.codegen_ref = codegen_ref
         self.nocobject_ref = codegen_ref.nocobject_ref
 
+class _codegen_entry(_slotted):
+    """
+    Base class for code model entries (generics, ports and signals)
+    
+    Entries store their fields in __slots__, and keep a dictionary-like 
+    access: entry["name"], entry.get(), entry.update(...), "name" in entry, 
+    len(entry), iteration, keys(), values(), items() and copy(). Like 
+    dictionary keys, only fields that have been set are listed. Extended 
+    classes list their public fields in _fields; other slots are internal.
+    
+    Entries added to a code model are indexed by name, so their name 
+    cannot be changed through item access or update() (ValueError).
+    """
+    __slots__ = ("_indexed",)
+    _fields = ()
+    _field_set = frozenset()
+    # mutable, compared by value (like dictionaries)
+    __hash__ = None
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+            
+    def __setitem__(self, key, value):
+        if key == "name":
+            self._check_rename(value)
+        try:
+            setattr(self, key, value)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+            
+    def __contains__(self, key):
+        return key in self._field_set and hasattr(self, key)
+        
+    def __iter__(self):
+        return iter(self.keys())
+        
+    def __len__(self):
+        return len(self.keys())
+        
+    def keys(self):
+        return [k for k in self._fields if hasattr(self, k)]
+        
+    def values(self):
+        return [getattr(self, k) for k in self.keys()]
+        
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.keys()]
+        
+    def get(self, key, default=None):
+        if key in self:
+            return getattr(self, key)
+        return default
+        
+    def __eq__(self, other):
+        if not isinstance(other, _codegen_entry):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self.items() == other.items()
+        
+    def __ne__(self, other):
+        if not isinstance(other, _codegen_entry):
+            return NotImplemented
+        return not self.__eq__(other)
+        
+    def update(self, other=None, **kwargs):
+        """
+        Update fields from a dictionary, another entry and/or keyword 
+        arguments. Unknown field names raise KeyError, and no field is 
+        changed in that case.
+        """
+        if other is None:
+            # keyword arguments only
+            self._check_fields(kwargs)
+            if "name" in kwargs:
+                self._check_rename(kwargs["name"])
+            for key, value in kwargs.iteritems():
+                setattr(self, key, value)
+            return
+        items = [(key, other[key]) for key in other.keys()]
+        if kwargs:
+            items.extend(kwargs.items())
+        self._check_fields([key for key, value in items])
+        for key, value in items:
+            if key == "name":
+                self._check_rename(value)
+        for key, value in items:
+            setattr(self, key, value)
+            
+    @classmethod
+    def _check_fields(cls, keys):
+        """
+        Raise KeyError for the first name in keys that is not a field of 
+        this entry class.
+        """
+        if cls._field_set.issuperset(keys):
+            return
+        for key in keys:
+            if key not in cls._field_set:
+                raise KeyError(key)
+                
+    def _check_rename(self, name):
+        """
+        Raise ValueError if this entry is indexed by name and name is not 
+        its current name.
+        """
+        if getattr(self, "_indexed", False) and name != self.name:
+            raise ValueError("Cannot rename indexed entry '%s' to '%s'." % (self.name, name))
+            
+    def copy(self):
+        """
+        Returns: a shallow copy of this entry. The copy is not indexed.
+        """
+        c = self.__class__.__new__(self.__class__)
+        for key in self.__slots__:
+            if hasattr(self, key):
+                setattr(c, key, getattr(self, key))
+        return c
+        
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, 
+            ", ".join(["%s=%s" % (k, repr(getattr(self, k))) for k in self.keys()]))
+
+class codegen_generic(_codegen_entry):
+    """
+    Generic entry for a code model. See 'noc_codegen_base' for its fields.
+    """
+    _fields = ("name", "type", "type_array", "default_value", 
+        "current_value", "description")
+    _field_set = frozenset(_fields)
+    __slots__ = _fields
+    
+    def __init__(self, name="", type="", type_array=None, default_value="", 
+            current_value="", description="", **kwargs):
+        if kwargs:
+            # only unknown field names are left
+            self._check_fields(kwargs)
+        self.name = name
+        self.type = type
+        if type_array is None:
+            type_array = [None, None]
+        self.type_array = type_array
+        self.default_value = default_value
+        self.current_value = current_value
+        self.description = description
+
+class codegen_port(_codegen_entry):
+    """
+    Port entry for a code model. See 'noc_codegen_base' for its fields.
+    
+    Signals in "signal_list" are also indexed by name in the internal 
+    _signals_by_name dictionary.
+    """
+    _fields = ("name", "type", "nocport", "signal_list", "description")
+    _field_set = frozenset(_fields)
+    __slots__ = _fields + ("_signals_by_name",)
+    
+    def __init__(self, name="", type="", nocport=None, signal_list=None, 
+            description="", **kwargs):
+        if kwargs:
+            # only unknown field names are left
+            self._check_fields(kwargs)
+        self.name = name
+        self.type = type
+        self.nocport = nocport
+        if signal_list is None:
+            signal_list = []
+        self.signal_list = signal_list
+        self.description = description
+        self._signals_by_name = {}
+
+class codegen_signal(_codegen_entry):
+    """
+    Signal entry for a code model. See 'noc_codegen_base' for its fields.
+    
+    Field "back_ref" is optional and stays unset until assigned.
+    """
+    _fields = ("name", "type", "type_array", "direction", "default_value", 
+        "related_generics", "description", "back_ref")
+    _field_set = frozenset(_fields)
+    __slots__ = _fields
+    
+    def __init__(self, name="", type="", type_array=None, direction="", 
+            default_value="", related_generics=None, description="", **kwargs):
+        self.name = name
+        self.type = type
+        if type_array is None:
+            type_array = [None, None]
+        self.type_array = type_array
+        self.direction = direction
+        self.default_value = default_value
+        if related_generics is None:
+            related_generics = []
+        self.related_generics = related_generics
+        self.description = description
+        if kwargs:
+            # optional "back_ref", or unknown field names
+            self._check_fields(kwargs)
+            for key, value in kwargs.iteritems():
+                setattr(self, key, value)
+
 # helper structures:
-# base objects for generics, ports and signals
-_empty_generic = {
-    "class": "generic", 
-    "name": "", 
-    "type": "", 
-    "type_array": [None, None],
-    "default_value": "",  
-    "current_value": "", 
-    "description": ""}
-_empty_port = {
-    "class": "port", 
-    "name": "",  
-    "type": "",
-    "nocport": None,
-    "signal_list": [],
-    "description": ""}
-_empty_signal = {
-    "class": "signal", 
-    "name": "",  
-    "type": "",  
-    "type_array": [None, None],
-    "direction": "",
-    "default_value": "",  
-    "related_generics": [], 
-    "description": ""}
+# valid nocobject references for code generation
+_VALID_REFS = (nocobject, noc)
+# supported value types for generics and signals
+_GEN_TYPES = (bool, int, intbv, str)
+_SCALAR_TYPES = (bool, int, intbv)
+# default indentation (4-space tabs), precomputed up to 16 levels
+_TAB = "    "
+_INDENTS = tuple([_TAB * i for i in range(17)])
+# interned vocabulary for signal directions
+_DIR_IN = intern("in")
+_DIR_OUT = intern("out")
+# valid signal directions
+_VALID_DIRS = frozenset((_DIR_IN, _DIR_OUT))
 
 # new structures generation
 def get_new_generic(**kwargs):
-    s = deepcopy(_empty_generic)
-    s.update(kwargs)
-    return s
+    return codegen_generic(**kwargs)
 def get_new_port(**kwargs):
-    s = deepcopy(_empty_port)
-    s.update(kwargs)
-    return s
+    return codegen_port(**kwargs)
 def get_new_signal(**kwargs):
-    s = deepcopy(_empty_signal)
-    s.update(kwargs)
-    return s
+    return codegen_signal(**kwargs)
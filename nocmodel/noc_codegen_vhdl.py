@@ -57,6 +57,8 @@ class noc_codegen_vhdl(noc_codegen_base):
     * ports
     * implementation
     """
+    __slots__ = ("usetab", "full_comments")
+    
     def __init__(self, nocobject_ref, **kwargs):
         noc_codegen_base.__init__(self, nocobject_ref, **kwargs)
         
@@ -79,7 +81,7 @@ class noc_codegen_vhdl(noc_codegen_base):
         Generate the entire file that implements this object.
         """
         # Unless code generation is externally generated.
-        if self.external_conversion:
+        if getattr(self, "external_conversion", False):
             # use "codemodel" object on nocobject_ref
             if hasattr(self.nocobject_ref, "codemodel"):
                 return self.nocobject_ref.codemodel.generate_file()
@@ -88,26 +90,26 @@ class noc_codegen_vhdl(noc_codegen_base):
         else:
             # first try to call build_implementation() method
             self.build_implementation()
-            sret = self.docheader + "\n\n" + self.libraries + "\n\n"
+            parts = [self._s("docheader"), "\n\n", self._s("libraries"), "\n\n"]
             if self.full_comments:
-                sret += self.make_comment("Object '%s' name '%s' description '%s'\n" % (repr(self.nocobject_ref), self.nocobject_ref.name, self.nocobject_ref.description))
-            sret += self.generate_entity_section() + "\n\n"
-            sret += self.generate_architecture_section() + "\n"
-            return sret
+                parts.append(self.make_comment("Object '%s' name '%s' description '%s'\n" % (repr(self.nocobject_ref), self.nocobject_ref.name, self.nocobject_ref.description)))
+            parts.extend([self.generate_entity_section(), "\n\n"])
+            parts.extend([self.generate_architecture_section(), "\n"])
+            return self._emit(parts)
     
     def generate_component(self):
         """
         Generate a component definition for this object.
         """
-        sret = "component %s\n" % self.modulename
+        parts = ["component %s\n" % self.modulename]
         stmp = self.generate_generics_section()
         if stmp != "":
-            sret += self.add_tab(stmp) + ";\n"
+            parts.extend([self.add_tab(stmp), ";\n"])
         stmp = self.generate_ports_section()
         if stmp != "":
-            sret += self.add_tab(stmp) + ";\n"
-        sret += "end component;\n"
-        return sret
+            parts.extend([self.add_tab(stmp), ";\n"])
+        parts.append("end component;\n")
+        return self._emit(parts)
 
     def generate_generic_declaration(self, generic=None, with_default=False):
         """
@@ -128,13 +130,7 @@ class noc_codegen_vhdl(noc_codegen_base):
                 l.append(self.generate_generic_declaration(i, with_default))
             return l
         else:
-            # search for correct index
-            if isinstance(generic, int):
-                g = self.generics[generic]
-            elif isinstance(generic, string):
-                g = filter(lambda s: s["name"] == generic, self.generics)[0]
-            else:
-                raise TypeError("Don't know how to search with '%s'." % repr(generic))
+            g = self._resolve_entry(self.generics, self._generics_by_name, generic)
             sret = "%s : %s" % (self.to_valid_str(g["name"]), g["type"])
             if with_default:
                 sret += ' := %s' % convert_value(g["default_value"], g["type"], g["type_array"])
@@ -167,15 +163,8 @@ class noc_codegen_vhdl(noc_codegen_base):
                 l.extend(pl)
             return l
         else:
-            # search for correct index
-            if isinstance(port, int):
-                idx = port
-            elif isinstance(port, string):
-                p = filter(lambda s: s["name"] == port, self.ports)[0]
-                idx = self.ports.index(p)
-            else:
-                raise TypeError("Don't know how to search with '%s'." % repr(port))
-            return self.generate_signal_declaration(idx, None, with_default)
+            # port is located by generate_signal_declaration
+            return self.generate_signal_declaration(port, None, with_default)
 
     def generate_signal_declaration(self, inport=None, signal=None, with_default=False):
         """
@@ -198,12 +187,7 @@ class noc_codegen_vhdl(noc_codegen_base):
                 r = range(len(self.external_signals))
             else:
                 # what port?
-                if isinstance(inport, int):
-                    g = self.ports[inport]
-                elif isinstance(inport, string):
-                    g = filter(lambda s: s["name"] == inport, self.ports)[0]
-                else:
-                    raise TypeError("Don't know how to search with '%s'." % repr(inport))
+                g = self._resolve_entry(self.ports, self._ports_by_name, inport)
                 r = range(len(g["signal_list"]))
             for i in r:
                 l.append(self.generate_signal_declaration(inport, i, with_default))
@@ -211,29 +195,14 @@ class noc_codegen_vhdl(noc_codegen_base):
         else:
             # locate either port or external_signals
             if inport is None:
-                if isinstance(signal, int):
-                    sig = self.external_signals[signal]
-                elif isinstance(signal, string):
-                    sig = filter(lambda s: s["name"] == signal, self.external_signals)[0]
-                else:
-                    raise TypeError("Don't know how to search with '%s'." % repr(signal))
+                sig = self._resolve_entry(self.external_signals, self._external_by_name, signal)
                 # put nothing as signal prefix
                 sprefix = ""
             else:
                 # what port?
-                if isinstance(inport, int):
-                    p = self.ports[inport]
-                elif isinstance(inport, string):
-                    p = filter(lambda s: s["name"] == inport, self.ports)[0]
-                else:
-                    raise TypeError("Don't know how to search with '%s'." % repr(inport))
+                p = self._resolve_entry(self.ports, self._ports_by_name, inport)
                 # what signal?
-                if isinstance(signal, int):
-                    sig = p["signal_list"][signal]
-                elif isinstance(signal, string):
-                    sig = filter(lambda s: s["name"] == signal, p["signal_list"])[0]
-                else:
-                    raise TypeError("Don't know how to search with '%s'." % repr(signal))
+                sig = self._resolve_entry(p["signal_list"], p._signals_by_name, signal)
                 # put port name as signal prefix
                 #sprefix = self.to_valid_str(p["name"]) + "_"
                 sprefix = ""
@@ -276,16 +245,17 @@ class noc_codegen_vhdl(noc_codegen_base):
         
         Returns: string or list of strings with <level> indentation levels.
         """
-        leveltabs = self.usetab*level
+        leveltabs = self._get_indent(level, self.usetab)
+        nltabs = "\n" + leveltabs
         if isinstance(data, str):
-            return "%s%s%s" % (leveltabs, data[:-1].replace("\n", "\n%s" % leveltabs), data[-1])
+            return "%s%s%s" % (leveltabs, data[:-1].replace("\n", nltabs), data[-1])
         else:
             # don't put exception catch. It is an error if data is not
             # iterable.
             it = iter(data)
             retval = []
             for s in data:
-                retval.append("%s%s%s" % (leveltabs, s[:-1].replace("\n", "\n%s" % leveltabs), s[-1]))
+                retval.append("%s%s%s" % (leveltabs, s[:-1].replace("\n", nltabs), s[-1]))
             return retval
             
     def to_valid_str(self, str_in):
@@ -351,17 +321,18 @@ class noc_codegen_vhdl(noc_codegen_base):
         """
         Add a port to the model - with VHDL type formatting. 
         """
-        p = noc_codegen_base.add_port(self, name, signal_desc, description, **kwargs)
+        # "default_value" applies to the signal, not to the port
+        port_kwargs = dict(kwargs)
+        port_kwargs.pop("default_value", None)
+        p = noc_codegen_base.add_port(self, name, signal_desc, description, **port_kwargs)
         if signal_desc is None:
             # nothing else to do
             return p
         # set correct type for the particular signal_desc
-        sig = filter(lambda x: x["name"] == signal_desc["name"], p["signal_list"])
-        if len(sig) == 0:
+        sig = p._signals_by_name.get(signal_desc["name"])
+        if sig is None:
             # strange error
             raise ValueError("Strange error: recently added signal '%s' to port '%s', but signal cannot be found." % (signal_desc["name"], p["name"]))
-        else:
-            sig = sig[0]
         # type inferring: only apply if signal_desc has empty type
         if sig["type"] != "":
             return p
@@ -442,57 +413,49 @@ class noc_codegen_vhdl(noc_codegen_base):
         """
         Generate entity section
         """
-        sret = "entity %s is\n" % self.modulename
+        parts = ["entity %s is\n" % self.modulename]
         stmp = self.generate_generics_section()
         if stmp != "":
-            sret += self.add_tab(stmp) + ";\n"
+            parts.extend([self.add_tab(stmp), ";\n"])
         stmp = self.generate_ports_section()
         if stmp != "":
-            sret += self.add_tab(stmp) + ";\n"
-        sret += "end %s;\n" % self.modulename
-        return sret
+            parts.extend([self.add_tab(stmp), ";\n"])
+        parts.append("end %s;\n" % self.modulename)
+        return self._emit(parts)
         
     def generate_architecture_section(self, archname="rtl"):
         """
         Generate architecture section
         """
-        sret = "architecture %s of %s is\n" % (archname, self.modulename)
+        parts = ["architecture %s of %s is\n" % (archname, self.modulename)]
         if self.implementation != "":
-            sret += self.add_tab(self.implementation)
-        sret += "\nend %s;\n" % archname
-        return sret
+            parts.append(self.add_tab(self.implementation))
+        parts.append("\nend %s;\n" % archname)
+        return self._emit(parts)
 
     def generate_generics_section(self):
         """
         Generate generics section used on entity and component
         """
-        sret = "generic (\n"
         l = self.generate_generic_declaration(None, True)
         if len(l) > 0:
-            l = self.add_tab(l)
-            sret += ";\n".join(l)
-            sret += "\n)"
+            return self._emit(["generic (\n", ";\n".join(self.add_tab(l)), "\n)"])
         else:
             # empty generics section
-            sret = ""
-        return sret
+            return ""
         
     def generate_ports_section(self):
         """
         Generate ports section used on entity and component
         """
         # first ports and then external signals
-        sret = "port (\n"
         l = self.generate_port_declaration(None, False)
         l.extend(self.generate_signal_declaration(None, None, False))
         if len(l) > 0:
-            l = self.add_tab(l)
-            sret += ";\n".join(l)
-            sret += "\n)"
+            return self._emit(["port (\n", ";\n".join(self.add_tab(l)), "\n)"])
         else:
             # empty ports section
-            sret = ""
-        return sret
+            return ""
         
     def calculate_type(self, object, with_default=False):
         """